@@ -14,7 +14,8 @@ from utils.prompt_builder import build_prompt
 from utils.doc_generator import create_word_document
 from utils.db_connector import (
     init_generator_tables, authenticate_user,
-    get_treatment_dictionary, get_specialties_list, get_hospitals_list,
+    get_treatment_dictionary, get_treatment_dictionary_rendered,
+    get_specialties_list, get_hospitals_list,
     get_active_prompt, get_all_prompts, save_prompt,
     save_profile, update_profile_content, get_recent_profiles,
     get_profile_by_id, get_profile_stats,
@@ -142,15 +143,17 @@ def generate():
             error_msg = 'Could not extract content. Try uploading screenshots or pasting info manually.'
             return jsonify({'error': error_msg}), 400
 
-        # Step 2: Load treatment dictionary
+        # Step 2: Load treatment dictionary (list for the count, cached
+        # pre-rendered string for the prompt)
         treatments = get_treatment_dictionary()
+        treatments_text = get_treatment_dictionary_rendered()
 
         # Step 3: Get active prompt template
         prompt_data = get_active_prompt()
         prompt_template = prompt_data.get('prompt_text', '') if isinstance(prompt_data, dict) else prompt_data
 
         # Step 4: Build final prompt
-        final_prompt = build_prompt(prompt_template, scraped, treatments)
+        final_prompt = build_prompt(prompt_template, scraped, treatments_text)
 
         # Step 5: Call Claude
         if CLAUDE_AVAILABLE:
@@ -281,17 +284,18 @@ def generate_from_files():
 
         # Build prompt
         treatments = get_treatment_dictionary()
+        treatments_text = get_treatment_dictionary_rendered()
         prompt_data = get_active_prompt()
         prompt_template = prompt_data.get('prompt_text', '') if isinstance(prompt_data, dict) else prompt_data
 
         if scraped:
-            final_prompt = build_prompt(prompt_template, scraped, treatments)
+            final_prompt = build_prompt(prompt_template, scraped, treatments_text)
         else:
             final_prompt = build_prompt(prompt_template, {
                 'combined_text': '(See attached screenshots)', 'titles': [],
                 'urls': [], 'url_count': 0, 'errors': [],
                 'has_manual_text': False, 'total_chars': 0
-            }, treatments)
+            }, treatments_text)
 
         if has_files:
             final_prompt += f"\n\nIMPORTANT: {len(file_images)} screenshot(s)/file(s) of the doctor's profile are attached. Extract ALL information from these images — name, qualifications, degrees, designations, specialties, experience, procedures, awards, hospital affiliations, memberships, and every other relevant detail. Use these images as the PRIMARY source."
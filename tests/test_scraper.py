@@ -0,0 +1,41 @@
+"""
+Regression tests for the scraper's JSON parsing shim.
+
+bs4 yields NavigableString (a str subclass) from script.string, which
+orjson rejects unless coerced — _json_loads must handle both.
+"""
+
+from bs4 import BeautifulSoup
+
+from utils.scraper import _extract_jsonld_blob, _json_loads
+
+_JSONLD_HTML = '<script type="application/ld+json">{"@type": "Physician", "name": "Dr. A"}</script>'
+
+
+def test_json_loads_accepts_navigable_string():
+    soup = BeautifulSoup(_JSONLD_HTML, 'html.parser')
+    raw = soup.find('script').string
+    assert not type(raw) is str  # the bs4 subclass is the point
+    assert _json_loads(raw) == {'@type': 'Physician', 'name': 'Dr. A'}
+
+
+def test_json_loads_accepts_plain_types():
+    assert _json_loads('{"a": 1}') == {'a': 1}
+    assert _json_loads(b'{"a": 1}') == {'a': 1}
+
+
+def test_extract_jsonld_blob_renders_soup_script():
+    soup = BeautifulSoup(_JSONLD_HTML, 'html.parser')
+    texts = []
+    _extract_jsonld_blob(soup.find('script').string, texts)
+    assert texts == ['Name: Dr. A']
+
+
+def test_extract_jsonld_blob_handles_list_typed_items():
+    # "@type": [...] is a common schema.org pattern and must neither
+    # raise nor abort the remaining items in the blob
+    blob = ('[{"@type": ["Person", "Physician"], "name": "Dr. Multi"},'
+            ' {"@type": "Physician", "name": "Dr. Single"}]')
+    texts = []
+    _extract_jsonld_blob(blob, texts)
+    assert texts == ['Name: Dr. Multi', 'Name: Dr. Single']
@@ -9,8 +9,12 @@ import psycopg2.extras
 import config
 import bcrypt
 import json
+import re
+import time
 from datetime import datetime
 
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
 
 def get_conn():
     if not config.DATABASE_URL:
@@ -32,7 +36,9 @@ def init_generator_tables():
         return
     try:
         with conn.cursor() as cur:
-            # Prompt templates (admin-editable)
+            # All DDL in one execute — a single protocol round-trip.
+            # Prompt templates (admin-editable), generated profiles history,
+            # and the BRIN index that keeps stats counts off the heap.
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS generator_prompts (
                     id SERIAL PRIMARY KEY,
@@ -42,10 +48,7 @@ def init_generator_tables():
                     created_by VARCHAR(255),
                     created_at TIMESTAMP DEFAULT NOW(),
                     updated_at TIMESTAMP DEFAULT NOW()
-                )
-            """)
-            # Generated profiles history
-            cur.execute("""
+                );
                 CREATE TABLE IF NOT EXISTS generator_profiles (
                     id SERIAL PRIMARY KEY,
                     doctor_name VARCHAR(300),
@@ -59,16 +62,17 @@ def init_generator_tables():
                     created_by VARCHAR(255),
                     created_at TIMESTAMP DEFAULT NOW(),
                     updated_at TIMESTAMP DEFAULT NOW()
-                )
+                );
+                CREATE INDEX IF NOT EXISTS idx_generator_profiles_created_at
+                ON generator_profiles USING brin (created_at);
             """)
-            # Check if default prompt exists
-            cur.execute("SELECT COUNT(*) FROM generator_prompts WHERE is_active = true")
-            count = cur.fetchone()[0]
-            if count == 0:
-                cur.execute("""
-                    INSERT INTO generator_prompts (name, prompt_text, is_active, created_by)
-                    VALUES ('Default Profile Generator', %s, true, 'system')
-                """, [DEFAULT_PROMPT])
+            # Seed the default prompt only if no active prompt exists yet.
+            # Single statement — idempotent and race-safe across concurrent boots.
+            cur.execute("""
+                INSERT INTO generator_prompts (name, prompt_text, is_active, created_by)
+                SELECT 'Default Profile Generator', %s, true, 'system'
+                WHERE NOT EXISTS (SELECT 1 FROM generator_prompts WHERE is_active)
+            """, [DEFAULT_PROMPT])
             conn.commit()
         print("✅ Generator tables ready")
     except Exception as e:
@@ -125,6 +129,12 @@ def authenticate_user(email, password):
 
 # ── Treatment Dictionary ─────────────────────────────────────
 
+# Cached by max(updated_at) of published treatments — refetch only when the
+# admin app actually changes something. 'rendered' is the prompt fragment,
+# built lazily from 'rows'.
+_TREATMENT_CACHE = {'stamp': None, 'rows': None, 'rendered': None}
+
+
 def get_treatment_dictionary():
     """
     Returns the FULL treatment dictionary for Claude prompt injection.
@@ -135,6 +145,11 @@ def get_treatment_dictionary():
         return []
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("SELECT max(updated_at) AS stamp FROM treatments WHERE status = 'published'")
+            row = cur.fetchone()
+            stamp = row['stamp'] if row else None
+            if stamp is not None and stamp == _TREATMENT_CACHE['stamp']:
+                return _TREATMENT_CACHE['rows']
             cur.execute("""
                 SELECT t.name, t.slug, t.description,
                        t.duration, t.recovery_time, t.success_rate, t.cost_range_usd,
@@ -144,7 +159,12 @@ def get_treatment_dictionary():
                 WHERE t.status = 'published'
                 ORDER BY s.name, t.name
             """)
-            return [dict(r) for r in cur.fetchall()]
+            rows = [dict(r) for r in cur.fetchall()]
+            if stamp is not None:
+                _TREATMENT_CACHE['stamp'] = stamp
+                _TREATMENT_CACHE['rows'] = rows
+                _TREATMENT_CACHE['rendered'] = None
+            return rows
     except Exception as e:
         print(f"[DB Error] get_treatment_dictionary: {e}")
         return []
@@ -152,6 +172,38 @@ def get_treatment_dictionary():
         conn.close()
 
 
+def get_treatment_dictionary_rendered():
+    """
+    Returns the treatment dictionary already rendered as the prompt fragment.
+    Served from cache while max(updated_at) is unchanged, so the usual cost
+    is one sub-ms freshness query plus a string return.
+    """
+    from utils.prompt_builder import format_treatment_dictionary
+    rows = get_treatment_dictionary()
+    if _TREATMENT_CACHE['rows'] is rows:
+        if _TREATMENT_CACHE['rendered'] is None:
+            _TREATMENT_CACHE['rendered'] = format_treatment_dictionary(rows)
+        return _TREATMENT_CACHE['rendered']
+    return format_treatment_dictionary(rows)
+
+
+def get_procedures_from_db():
+    """
+    Legacy API shape (sheet-style column names) kept for old call sites.
+    Thin wrapper over get_treatment_dictionary — one query, one cache.
+    RealDictCursor always returns every selected column (None when NULL),
+    so direct subscripts are safe here.
+    """
+    return [{
+        'Entity_Name': r['name'] or '',
+        'Top_Specialty': r['specialty'] or '',
+        'Sub_Specialty': r['specialty_category'] or '',
+        'Complexity_Level': '',
+        'slug': r['slug'] or '',
+        'duration': r['duration'] or '',
+    } for r in get_treatment_dictionary()]
+
+
 def get_specialties_list():
     """Returns all published specialties for reference"""
     conn = get_conn()
@@ -346,20 +398,34 @@ def get_profile_by_id(profile_id):
         conn.close()
 
 
+_STATS_CACHE = {'at': 0.0, 'stats': None}
+_STATS_TTL = 30  # seconds — dashboard stats don't need to be real-time
+
+
 def get_profile_stats():
+    now = time.monotonic()
+    if _STATS_CACHE['stats'] is not None and now - _STATS_CACHE['at'] < _STATS_TTL:
+        return _STATS_CACHE['stats']
     conn = get_conn()
     if not conn:
         return {'total': 0, 'today': 0, 'week': 0}
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            # Planner estimate for the total (no heap scan); today/week stay
+            # exact but ride the BRIN index on created_at.
             cur.execute("""
                 SELECT
-                    COUNT(*) AS total,
-                    COUNT(*) FILTER (WHERE created_at::date = CURRENT_DATE) AS today,
-                    COUNT(*) FILTER (WHERE created_at > NOW() - INTERVAL '7 days') AS week
-                FROM generator_profiles
+                    GREATEST((SELECT reltuples::bigint FROM pg_class
+                              WHERE relname = 'generator_profiles'), 0) AS total,
+                    (SELECT COUNT(*) FROM generator_profiles
+                     WHERE created_at::date = CURRENT_DATE) AS today,
+                    (SELECT COUNT(*) FROM generator_profiles
+                     WHERE created_at > NOW() - INTERVAL '7 days') AS week
             """)
-            return dict(cur.fetchone())
+            stats = dict(cur.fetchone())
+            _STATS_CACHE['at'] = now
+            _STATS_CACHE['stats'] = stats
+            return stats
     except Exception as e:
         print(f"[DB Error] {e}")
         return {'total': 0, 'today': 0, 'week': 0}
@@ -429,8 +495,7 @@ def check_doctor_slug_exists(slug):
 
 def generate_doctor_slug(name):
     """Generate a unique slug for a doctor"""
-    import re
-    base = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+    base = _SLUG_RE.sub('-', name.lower()).strip('-')
     slug = base
     counter = 1
     while check_doctor_slug_exists(slug):
@@ -456,6 +521,9 @@ def push_doctor_to_admin(data, profile_id=None, user_email=''):
         return {'success': False, 'error': 'Database not connected'}
 
     try:
+        # Everything up to the commit is one explicit transaction; junction
+        # inserts are isolated with savepoints so a bad row can't abort it.
+        conn.autocommit = False
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             name = data.get('name', '').strip()
             if not name:
@@ -552,13 +620,17 @@ def push_doctor_to_admin(data, profile_id=None, user_email=''):
                 # Clear existing links
                 cur.execute("DELETE FROM doctor_treatments WHERE doctor_id = %s", [doctor_id])
                 for tid in treatment_ids:
+                    cur.execute("SAVEPOINT link_treatment")
                     try:
                         cur.execute("""
                             INSERT INTO doctor_treatments (doctor_id, treatment_id)
                             VALUES (%s, %s) ON CONFLICT DO NOTHING
                         """, [doctor_id, tid])
-                    except Exception:
-                        pass  # Skip if junction insert fails
+                        cur.execute("RELEASE SAVEPOINT link_treatment")
+                    except Exception as link_err:
+                        # Skip the bad row but keep the transaction alive
+                        print(f"[DB Warning] doctor_treatments link {tid}: {link_err}")
+                        cur.execute("ROLLBACK TO SAVEPOINT link_treatment")
 
             # Update generator_profiles status to 'pushed'
             if profile_id:
@@ -6,6 +6,14 @@ Assembles the final Claude prompt from:
   3. Treatment dictionary (from DB specialties + treatments)
 """
 
+from collections import defaultdict
+
+
+class _SafeDict(dict):
+    """Leaves unknown {placeholders} intact instead of raising KeyError"""
+    def __missing__(self, key):
+        return '{' + key + '}'
+
 
 def build_prompt(prompt_template, scraped_data, treatment_dict):
     """
@@ -22,12 +30,21 @@ def build_prompt(prompt_template, scraped_data, treatment_dict):
     # Format scraped data
     scraped_text = format_scraped_data(scraped_data)
 
-    # Fill template
-    final_prompt = prompt_template
-    final_prompt = final_prompt.replace('{scraped_data}', scraped_text)
-    final_prompt = final_prompt.replace('{treatment_dictionary}', treatments_text)
-
-    return final_prompt
+    # Fill template in a single pass — two chained .replace calls each
+    # rewrote the whole (large) prompt buffer.
+    try:
+        return prompt_template.format_map(_SafeDict(
+            scraped_data=scraped_text,
+            treatment_dictionary=treatments_text,
+        ))
+    except Exception:
+        # Admin-edited templates are free text — stray braces raise
+        # ValueError/IndexError, and attribute/index placeholders like
+        # {x.y} or {x[y]} raise AttributeError/TypeError. Any of them
+        # means "not a format string": fall back to plain replacement,
+        # which can never fail.
+        final_prompt = prompt_template.replace('{scraped_data}', scraped_text)
+        return final_prompt.replace('{treatment_dictionary}', treatments_text)
 
 
 def format_treatment_dictionary(treatments):
@@ -35,23 +52,21 @@ def format_treatment_dictionary(treatments):
     Formats the treatment dictionary into a structured reference
     grouped by specialty for easy reading by Claude.
     """
+    if isinstance(treatments, str):
+        return treatments  # already rendered (cached fragment from db_connector)
+
     if not treatments:
         return "(No treatments loaded from database)"
 
     # Group by specialty
-    by_specialty = {}
+    by_specialty = defaultdict(list)
     for t in treatments:
-        spec = t.get('specialty') or 'Uncategorized'
-        if spec not in by_specialty:
-            by_specialty[spec] = []
-        by_specialty[spec].append(t.get('name', ''))
+        by_specialty[t.get('specialty') or 'Uncategorized'].append(t.get('name', ''))
 
     lines = []
-    for specialty in sorted(by_specialty.keys()):
-        procs = by_specialty[specialty]
+    for specialty in sorted(by_specialty):
         lines.append(f"\n[{specialty}]")
-        for proc in sorted(procs):
-            lines.append(f"  • {proc}")
+        lines.extend(f"  • {proc}" for proc in sorted(by_specialty[specialty]))
 
     lines.append(f"\nTotal: {len(treatments)} treatments across {len(by_specialty)} specialties")
     return '\n'.join(lines)
@@ -9,9 +9,140 @@ Multi-URL scraping with multiple extraction strategies:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import re
 import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Prefer the C-based lxml parser (5-10x faster than the pure-Python one);
+# fall back gracefully if it isn't installed.
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+# Prefer orjson for the large __NEXT_DATA__ / JSON-LD blobs (C parser,
+# several times faster); fall back gracefully if it isn't installed.
+try:
+    import orjson
+
+    def _json_loads(raw):
+        # orjson rejects str subclasses (bs4 hands us NavigableStrings
+        # via script.string) — go through bytes for those
+        return orjson.loads(raw.encode() if isinstance(raw, str) else raw)
+except ImportError:
+    def _json_loads(raw):
+        return json.loads(raw)
+
+
+# ── Precompiled patterns (hot paths run these per element/page) ──
+_NOISE_RE = re.compile(
+    r'(cookie|consent|popup|modal|banner|advert|sidebar|widget|social|share|comment|related|'
+    r'newsletter|subscribe|breadcrumb|pagination|menu|nav-|foot|header|toolbar|sticky|overlay)',
+    re.I
+)
+_CONTENT_CLASS_RE = re.compile(r'(content|main|doctor|profile|detail|about|bio|description)', re.I)
+_SECTION_CLASS_RE = re.compile(r'(content|main|doctor|profile|detail|about|bio)', re.I)
+_WS_RE = re.compile(r'\s+')
+_DOCTOR_SLUG_RE = re.compile(r'/doctor/([^/?#]+)')
+# Body-text line filter: keep lines >10 chars or list items — one multiline
+# regex pass instead of per-line Python string ops
+_LINE_FILTER_RE = re.compile(r'^(?:.{11,}|[•\-*–].*)$', re.M)
+_CHARSET_RE = re.compile(r'charset=([\w-]+)', re.I)
+
+# Raw-HTML fast path: grab JSON-LD script bodies and a title without
+# building a DOM at all
+_JSONLD_SCRIPT_RE = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.I | re.S
+)
+_H1_RE = re.compile(r'<h1[^>]*>(.*?)</h1>', re.I | re.S)
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.I | re.S)
+_TAG_STRIP_RE = re.compile(r'<[^>]+>')
+
+# Domains that are fully client-rendered behind a WAF; only their
+# site-specific strategy in try_site_specific_api can work.
+_SITE_SPECIFIC_ONLY = ('maxhealthcare.in',)
+
+_NOISE_TAGS = frozenset({'script', 'style', 'nav', 'footer', 'header', 'iframe',
+                         'noscript', 'svg', 'button', 'form', 'aside', 'figure'})
+
+
+def _is_noise(tag):
+    """Matches noise elements by tag name or by class/id pattern"""
+    if tag.name in _NOISE_TAGS:
+        return True
+    cls = tag.get('class')
+    if cls and _NOISE_RE.search(' '.join(cls)):
+        return True
+    tag_id = tag.get('id')
+    return bool(tag_id and _NOISE_RE.search(tag_id))
+
+# Next.js data extraction: keys worth keeping even when short, and
+# key fragments that mark noise (image URLs, slugs, ids)
+_NEXTDATA_SHORT_KEYS = frozenset({
+    'name', 'title', 'designation', 'qualification',
+    'degree', 'specialty', 'city', 'hospital', 'department',
+    'experience', 'language', 'jobtitle', 'position',
+})
+_NEXTDATA_SKIP_KEYS = ('image', 'url', 'slug', '_id')
+
+# Shared session: keep-alive + TLS reuse across URLs (doctor pages often
+# come in batches from the same host), with a bounded retry policy.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                       max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
+# Hard cap on bytes read per page — generous enough that JSON-LD or
+# __NEXT_DATA__ blobs late in the document still make it in, while
+# adversarially huge pages can't blow up memory or parse time.
+MAX_FETCH_BYTES = 2 * 1024 * 1024
+
+
+def _read_capped(response, cap=MAX_FETCH_BYTES):
+    """Read at most `cap` bytes from a streaming response, then close it."""
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(8192):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= cap:
+                break
+    finally:
+        response.close()
+    return b''.join(chunks)
+
+
+def _decode_html(raw, response):
+    """
+    Decode capped bytes. The charset is read straight off the
+    Content-Type header; requests defaults to ISO-8859-1 when the header
+    omits one, but utf-8 is the better guess for modern pages.
+    """
+    m = _CHARSET_RE.search(response.headers.get('Content-Type', ''))
+    encoding = m.group(1).lower() if m else 'utf-8'
+    if encoding in ('utf-8', 'iso-8859-1', 'latin-1'):
+        # Try strict utf-8 first even when the header says latin-1 —
+        # servers routinely mislabel utf-8 pages that way. A genuine
+        # latin-1 page fails the strict decode and gets its declared
+        # charset (which can never fail) instead of replacement chars.
+        try:
+            return raw.decode('utf-8')
+        except UnicodeDecodeError:
+            if encoding != 'utf-8':
+                return raw.decode('latin-1')
+            return raw.decode('utf-8', errors='replace')
+    try:
+        return raw.decode(encoding, errors='replace')
+    except LookupError:
+        return raw.decode('utf-8', errors='replace')
 
 
 # ── User Agents (rotate to avoid blocks) ─────────────────────
@@ -22,6 +153,22 @@ USER_AGENTS = [
 ]
 
 
+# Per-URL scrape outcome — a namedtuple instead of a dict saves one
+# dict construction per URL and keeps field access cheap in the merge loop
+ScrapeResult = namedtuple('ScrapeResult', 'text title method error')
+ScrapeResult.__new__.__defaults__ = ('', '', '', '')
+
+
+def _build_result(title, method, *sections, limit=8000):
+    """Assemble a successful ScrapeResult from a title and non-empty sections"""
+    body = '\n\n'.join(s for s in sections if s)
+    return ScrapeResult(
+        text=f"[Page: {title}]\n\n{body}"[:limit],
+        title=title,
+        method=method
+    )
+
+
 def scrape_multiple_urls(urls, manual_text=''):
     """
     Scrapes multiple URLs and merges all extracted text.
@@ -33,18 +180,21 @@ def scrape_multiple_urls(urls, manual_text=''):
     all_titles = []
     errors = []
 
-    for i, url in enumerate(urls):
-        url = url.strip()
-        if not url:
-            continue
-
-        data = scrape_single_url(url, agent_index=i)
-        if data and data.get('text') and len(data['text'].strip()) > 50:
-            all_sections.append(f"=== SOURCE: {url} ===\n{data['text']}")
-            all_titles.append(data.get('title', ''))
+    # Fetch all URLs concurrently — scraping is network-bound, so wall time
+    # becomes roughly the slowest URL instead of the sum of all of them.
+    cleaned_urls = [u.strip() for u in urls if u.strip()]
+    results = []
+    if cleaned_urls:
+        with ThreadPoolExecutor(max_workers=min(8, len(cleaned_urls))) as executor:
+            results = list(executor.map(scrape_single_url, cleaned_urls, range(len(cleaned_urls))))
+
+    for url, data in zip(cleaned_urls, results):
+        if data and data.text and len(data.text.strip()) > 50:
+            all_sections.append(f"=== SOURCE: {url} ===\n{data.text}")
+            all_titles.append(data.title)
             successful_urls.append(url)
         else:
-            error_msg = data.get('error', 'No content extracted') if data else 'Request failed'
+            error_msg = (data.error or 'No content extracted') if data else 'Request failed'
             errors.append(f"{url}: {error_msg}")
 
     # Add manual text if provided
@@ -67,16 +217,45 @@ def scrape_multiple_urls(urls, manual_text=''):
     }
 
 
+# In-process result cache — retry/refresh flows re-submit the same URLs,
+# and a hit skips the whole fetch+parse. Successful results only.
+_SCRAPE_CACHE = {}
+_SCRAPE_CACHE_MAX = 256
+
+
 def scrape_single_url(url, agent_index=0):
     """
     Scrapes a single URL using multiple extraction strategies.
-    Returns dict with 'text', 'title', 'method' or None on failure.
+    Returns a ScrapeResult, or None on failure.
+    Successful results are memoized per process.
     """
+    cache_key = url.strip().rstrip('/')
+    cached = _SCRAPE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = _scrape_single_url(url, agent_index)
+    if result and result.text and not result.error:
+        if len(_SCRAPE_CACHE) >= _SCRAPE_CACHE_MAX:
+            _SCRAPE_CACHE.clear()
+        _SCRAPE_CACHE[cache_key] = result
+    return result
+
+
+def _scrape_single_url(url, agent_index=0):
     # ── Pre-check: Site-specific API extraction ──────────
     site_result = try_site_specific_api(url)
-    if site_result and site_result.get('text') and len(site_result['text']) > 100:
+    if site_result and site_result.text and len(site_result.text) > 100:
         return site_result
 
+    # Known client-rendered domains: once the site-specific strategy has
+    # failed, the generic header-rotation loop never succeeds either —
+    # don't burn 3 more round-trips on it.
+    if any(domain in url.lower() for domain in _SITE_SPECIFIC_ONLY):
+        return site_result or ScrapeResult(
+            error='JavaScript-rendered page — use manual input'
+        )
+
     # ── Standard HTML scraping with retry ────────────────
     html = None
     last_error = ''
@@ -109,14 +288,17 @@ def scrape_single_url(url, agent_index=0):
 
     for i, headers in enumerate(header_sets):
         try:
-            response = requests.get(url, headers=headers, timeout=20, allow_redirects=True)
-            if response.status_code == 200 and len(response.text) > 500:
-                if response.encoding and response.encoding.lower() != 'utf-8':
-                    response.encoding = response.apparent_encoding or 'utf-8'
-                html = response.text
+            response = _SESSION.get(url, headers=headers, timeout=20, allow_redirects=True, stream=True)
+            if response.status_code != 200:
+                last_error = f'HTTP {response.status_code} (attempt {i+1})'
+                response.close()
+                continue
+            raw = _read_capped(response)
+            if len(raw) > 500:
+                html = _decode_html(raw, response)
                 break
             else:
-                last_error = f'HTTP {response.status_code} (attempt {i+1})'
+                last_error = f'Empty response (attempt {i+1})'
         except requests.exceptions.Timeout:
             last_error = f'Timeout (attempt {i+1})'
         except requests.exceptions.ConnectionError as e:
@@ -126,90 +308,69 @@ def scrape_single_url(url, agent_index=0):
             last_error = str(e)[:100]
 
     if not html:
-        return {'text': '', 'title': '', 'error': last_error or 'Could not fetch page'}
-
-    soup = BeautifulSoup(html, 'html.parser')
-
-    # Get page title
-    title = ''
-    h1 = soup.find('h1')
-    title_tag = soup.find('title')
-    if h1:
-        title = h1.get_text(strip=True)
-    elif title_tag:
-        title = title_tag.get_text(strip=True)
-
-        # ── Strategy 1: JSON-LD structured data ──────────────
-        jsonld_text = extract_jsonld(soup)
-        if jsonld_text and len(jsonld_text) > 100:
-            # Still try to get semantic content to supplement JSON-LD
-            semantic_text = extract_semantic_content(soup)
-            combined = f"[Page: {title}]\n\n--- Structured Data ---\n{jsonld_text}"
-            if semantic_text and len(semantic_text) > 100:
-                combined += f"\n\n--- Page Content ---\n{semantic_text}"
-            return {
-                'text': combined[:8000],
-                'title': title,
-                'method': 'json-ld'
-            }
-
-        # ── Strategy 1b: Next.js __NEXT_DATA__ ───────────────
-        nextdata_text = extract_nextdata(soup)
-        if nextdata_text and len(nextdata_text) > 100:
-            semantic_text = extract_semantic_content(soup)
-            combined = f"[Page: {title}]\n\n--- Next.js Data ---\n{nextdata_text}"
-            if semantic_text and len(semantic_text) > 100:
-                combined += f"\n\n--- Page Content ---\n{semantic_text}"
-            return {
-                'text': combined[:8000],
-                'title': title,
-                'method': 'nextjs-data'
-            }
-
-        # ── Strategy 2: Meta tags ────────────────────────────
-        meta_text = extract_meta_tags(soup)
-
-        # ── Strategy 3: Semantic HTML content ────────────────
+        return ScrapeResult(error=last_error or 'Could not fetch page')
+
+    # ── Strategy 0: JSON-LD straight off the raw HTML ────
+    # When the structured data alone is substantial, skip DOM
+    # construction entirely.
+    jsonld_fast = extract_jsonld_fast(html)
+    if jsonld_fast and len(jsonld_fast) > 300:
+        return _build_result(_page_title_fast(html), 'json-ld',
+                             f"--- Structured Data ---\n{jsonld_fast}")
+
+    soup = BeautifulSoup(html, PARSER)
+
+    # Page title: computed once up front — the .h1/.title attribute
+    # shortcuts stop at the first match instead of re-walking the tree
+    # in every strategy below.
+    title = ((soup.h1.get_text(strip=True) if soup.h1 else '')
+             or (soup.title.get_text(strip=True) if soup.title else ''))
+
+    # ── Strategy 1: JSON-LD structured data ──────────────
+    jsonld_text = extract_jsonld(soup)
+    if jsonld_text and len(jsonld_text) > 100:
+        # Still try to get semantic content to supplement JSON-LD
+        semantic_text = extract_semantic_content(soup)
+        return _build_result(
+            title, 'json-ld',
+            f"--- Structured Data ---\n{jsonld_text}",
+            f"--- Page Content ---\n{semantic_text}" if semantic_text and len(semantic_text) > 100 else ''
+        )
+
+    # ── Strategy 1b: Next.js __NEXT_DATA__ ───────────────
+    nextdata_text = extract_nextdata(soup)
+    if nextdata_text and len(nextdata_text) > 100:
         semantic_text = extract_semantic_content(soup)
+        return _build_result(
+            title, 'nextjs-data',
+            f"--- Next.js Data ---\n{nextdata_text}",
+            f"--- Page Content ---\n{semantic_text}" if semantic_text and len(semantic_text) > 100 else ''
+        )
 
-        if semantic_text and len(semantic_text) > 200:
-            full_text = f"[Page: {title}]\n"
-            if meta_text:
-                full_text += f"\n{meta_text}\n"
-            full_text += f"\n{semantic_text}"
-            return {
-                'text': full_text[:8000],
-                'title': title,
-                'method': 'semantic'
-            }
-
-        # ── Strategy 4: Full body text fallback ──────────────
-        body_text = extract_body_text(soup)
-
-        if body_text and len(body_text) > 100:
-            full_text = f"[Page: {title}]\n"
-            if meta_text:
-                full_text += f"\n{meta_text}\n"
-            full_text += f"\n{body_text}"
-            return {
-                'text': full_text[:8000],
-                'title': title,
-                'method': 'body-text'
-            }
-
-        # ── Strategy 5: Last resort — meta only ─────────────
-        if meta_text:
-            return {
-                'text': f"[Page: {title}]\n\n{meta_text}",
-                'title': title,
-                'method': 'meta-only'
-            }
-
-        return {
-            'text': f"[Page: {title}]\n\n(Page appears to be JavaScript-rendered. Content could not be extracted automatically. Please paste the doctor's information manually using the text box below.)",
-            'title': title,
-            'error': 'JavaScript-rendered page — use manual input'
-        }
+    # ── Strategy 2: Meta tags ────────────────────────────
+    meta_text = extract_meta_tags(soup)
+
+    # ── Strategy 3: Semantic HTML content ────────────────
+    semantic_text = extract_semantic_content(soup)
+
+    if semantic_text and len(semantic_text) > 200:
+        return _build_result(title, 'semantic', meta_text, semantic_text)
+
+    # ── Strategy 4: Full body text fallback ──────────────
+    body_text = extract_body_text(soup)
+
+    if body_text and len(body_text) > 100:
+        return _build_result(title, 'body-text', meta_text, body_text)
+
+    # ── Strategy 5: Last resort — meta only ─────────────
+    if meta_text:
+        return _build_result(title, 'meta-only', meta_text)
+
+    return ScrapeResult(
+        text=f"[Page: {title}]\n\n(Page appears to be JavaScript-rendered. Content could not be extracted automatically. Please paste the doctor's information manually using the text box below.)",
+        title=title,
+        error='JavaScript-rendered page — use manual input'
+    )
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -238,10 +399,8 @@ def scrape_max_healthcare(url):
     2. Google's cached version
     3. Mobile user agent (sometimes bypasses WAF)
     """
-    import re
-
     # Extract doctor slug from URL
-    match = re.search(r'/doctor/([^/?#]+)', url)
+    match = _DOCTOR_SLUG_RE.search(url)
     if not match:
         return None
     slug = match.group(1)
@@ -289,70 +448,43 @@ def scrape_max_healthcare(url):
 
     for headers in headers_options:
         try:
-            response = requests.get(url, headers=headers, timeout=25, allow_redirects=True)
-            if response.status_code == 200 and len(response.text) > 1000:
-                if response.encoding and response.encoding.lower() != 'utf-8':
-                    response.encoding = response.apparent_encoding or 'utf-8'
+            response = _SESSION.get(url, headers=headers, timeout=25, allow_redirects=True)
+            # Size-gate on the raw bytes — response.text would decode the
+            # whole body just to measure it
+            if response.status_code == 200 and len(response.content) > 1000:
+                html = _decode_html(response.content, response)
+                soup = BeautifulSoup(html, PARSER)
 
-                html = response.text
-                soup = BeautifulSoup(html, 'html.parser')
+                # Title computed once per fetched page and reused by every
+                # strategy below (.h1 stops at the first match)
+                title = soup.h1.get_text(strip=True) if soup.h1 else ''
 
                 # Try __NEXT_DATA__ first
                 nextdata = extract_nextdata(soup)
                 if nextdata and len(nextdata) > 100:
-                    title = ''
-                    h1 = soup.find('h1')
-                    if h1:
-                        title = h1.get_text(strip=True)
-                    return {
-                        'text': f"[Page: {title or slug}]\n\n--- Max Healthcare Profile ---\n{nextdata}",
-                        'title': title or slug,
-                        'method': 'max-nextjs'
-                    }
+                    return _build_result(title or slug, 'max-nextjs',
+                                         f"--- Max Healthcare Profile ---\n{nextdata}")
 
                 # Try JSON-LD
                 jsonld = extract_jsonld(soup)
                 if jsonld and len(jsonld) > 100:
-                    title = ''
-                    h1 = soup.find('h1')
-                    if h1:
-                        title = h1.get_text(strip=True)
                     semantic = extract_semantic_content(soup)
-                    text = f"[Page: {title or slug}]\n\n--- Structured Data ---\n{jsonld}"
-                    if semantic and len(semantic) > 100:
-                        text += f"\n\n--- Page Content ---\n{semantic}"
-                    return {
-                        'text': text[:8000],
-                        'title': title or slug,
-                        'method': 'max-jsonld'
-                    }
+                    return _build_result(
+                        title or slug, 'max-jsonld',
+                        f"--- Structured Data ---\n{jsonld}",
+                        f"--- Page Content ---\n{semantic}" if semantic and len(semantic) > 100 else ''
+                    )
 
                 # Try semantic/body extraction
                 semantic = extract_semantic_content(soup)
                 if semantic and len(semantic) > 200:
-                    title = ''
-                    h1 = soup.find('h1')
-                    if h1:
-                        title = h1.get_text(strip=True)
                     meta = extract_meta_tags(soup)
-                    text = f"[Page: {title or slug}]\n"
-                    if meta:
-                        text += f"\n{meta}\n"
-                    text += f"\n{semantic}"
-                    return {
-                        'text': text[:8000],
-                        'title': title or slug,
-                        'method': 'max-semantic'
-                    }
+                    return _build_result(title or slug, 'max-semantic', meta, semantic)
 
                 # Even body text
                 body = extract_body_text(soup)
                 if body and len(body) > 200:
-                    return {
-                        'text': f"[Page: {slug}]\n\n{body}"[:8000],
-                        'title': slug,
-                        'method': 'max-body'
-                    }
+                    return _build_result(slug, 'max-body', body)
 
         except Exception as e:
             print(f"[Max Scrape] {headers.get('User-Agent','')[:30]}... : {e}")
@@ -365,18 +497,18 @@ def scrape_max_healthcare(url):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
             'Accept': 'text/html',
         }
-        response = requests.get(cache_url, headers=cache_headers, timeout=15, allow_redirects=True)
-        if response.status_code == 200 and len(response.text) > 1000:
-            soup = BeautifulSoup(response.text, 'html.parser')
+        response = _SESSION.get(cache_url, headers=cache_headers, timeout=15, allow_redirects=True)
+        if response.status_code == 200 and len(response.content) > 1000:
+            soup = BeautifulSoup(_decode_html(response.content, response), PARSER)
             semantic = extract_semantic_content(soup)
             body = extract_body_text(soup) if not semantic else ''
             content = semantic or body
             if content and len(content) > 200:
-                return {
-                    'text': f"[Page: {slug} (Google Cache)]\n\n{content}"[:8000],
-                    'title': slug,
-                    'method': 'google-cache'
-                }
+                return ScrapeResult(
+                    text=f"[Page: {slug} (Google Cache)]\n\n{content}"[:8000],
+                    title=slug,
+                    method='google-cache'
+                )
     except Exception as e:
         print(f"[Google Cache] {e}")
 
@@ -398,43 +530,36 @@ def extract_nextdata(soup):
         return ''
 
     try:
-        data = json.loads(script.string)
+        data = _json_loads(script.string)
         props = data.get('props', {}).get('pageProps', {})
         if not props:
             return ''
 
         parts = []
 
-        # Recursively extract text values from nested dicts/lists
-        def extract_strings(obj, prefix='', depth=0):
-            if depth > 6:
-                return
-            if isinstance(obj, str):
-                cleaned = obj.strip()
-                # Skip very short strings, URLs, IDs, HTML tags
-                if (len(cleaned) > 20 and
-                    not cleaned.startswith('http') and
-                    not cleaned.startswith('/') and
-                    not cleaned.startswith('<') and
-                    not cleaned.startswith('{') and
-                    'image' not in prefix.lower() and
-                    'url' not in prefix.lower() and
-                    'slug' not in prefix.lower() and
-                    'id' != prefix.lower() and
-                    '_id' not in prefix.lower()):
-                    parts.append(cleaned)
-                elif 5 < len(cleaned) <= 20 and prefix.lower() in (
-                    'name', 'title', 'designation', 'qualification',
-                    'degree', 'specialty', 'city', 'hospital', 'department',
-                    'experience', 'language', 'jobtitle', 'position'
-                ):
-                    parts.append(f"{prefix}: {cleaned}")
-            elif isinstance(obj, dict):
-                for k, v in obj.items():
-                    extract_strings(v, k, depth + 1)
-            elif isinstance(obj, list):
-                for item in obj[:50]:  # Cap at 50 items
-                    extract_strings(item, prefix, depth + 1)
+        # Walk nested dicts/lists with an explicit stack — Max Healthcare
+        # blobs have thousands of string nodes, so call overhead matters
+        def extract_strings(root, prefix='', depth=0):
+            stack = [(root, prefix, depth)]
+            while stack:
+                obj, prefix, depth = stack.pop()
+                if depth > 6:
+                    continue
+                if isinstance(obj, str):
+                    cleaned = obj.strip()
+                    lp = prefix.lower()
+                    # Skip very short strings, URLs, IDs, HTML tags
+                    if (len(cleaned) > 20 and
+                        not cleaned.startswith(('http', '/', '<', '{')) and
+                        lp != 'id' and
+                        not any(k in lp for k in _NEXTDATA_SKIP_KEYS)):
+                        parts.append(cleaned)
+                    elif 5 < len(cleaned) <= 20 and lp in _NEXTDATA_SHORT_KEYS:
+                        parts.append(f"{prefix}: {cleaned}")
+                elif isinstance(obj, dict):
+                    stack.extend((v, k, depth + 1) for k, v in reversed(obj.items()))
+                elif isinstance(obj, list):
+                    stack.extend((item, prefix, depth + 1) for item in reversed(obj[:50]))
 
         # Look for doctor-specific keys first
         doctor_keys = ['doctor', 'doctorDetail', 'doctorData', 'profileData',
@@ -452,14 +577,17 @@ def extract_nextdata(soup):
             # Fallback: extract from all props
             extract_strings(props)
 
-        # Deduplicate while preserving order
+        # Deduplicate while preserving order — store 64-bit hashes rather
+        # than the normalized strings themselves to keep the set small
         seen = set()
         unique_parts = []
         for p in parts:
             normalized = p.lower().strip()
-            if normalized not in seen and len(normalized) > 3:
-                seen.add(normalized)
-                unique_parts.append(p)
+            if len(normalized) > 3:
+                key = hash(normalized)
+                if key not in seen:
+                    seen.add(key)
+                    unique_parts.append(p)
 
         return '\n'.join(unique_parts[:100])  # Cap at 100 entries
 
@@ -474,86 +602,137 @@ def extract_jsonld(soup):
     Many hospital websites include Physician/MedicalBusiness schema.
     """
     texts = []
-    for script in soup.find_all('script', type='application/ld+json'):
-        try:
-            raw = script.string
-            if not raw:
+    # Plain find_all('script') + a Python type check beats BS4's
+    # attribute-matcher machinery inside find_all
+    for script in soup.find_all('script'):
+        if script.get('type') != 'application/ld+json':
+            continue
+        raw = script.string
+        if raw:
+            _extract_jsonld_blob(raw, texts)
+    return '\n\n'.join(texts)
+
+
+def extract_jsonld_fast(html):
+    """
+    Regex-level JSON-LD extraction straight off the raw HTML — lets
+    scrape_single_url skip DOM construction entirely when structured
+    data alone is enough.
+    """
+    texts = []
+    for m in _JSONLD_SCRIPT_RE.finditer(html):
+        _extract_jsonld_blob(m.group(1), texts)
+    return '\n\n'.join(texts)
+
+
+def _page_title_fast(html):
+    """Pull a page title off raw HTML without building a tree"""
+    m = _H1_RE.search(html) or _TITLE_RE.search(html)
+    if not m:
+        return ''
+    return _WS_RE.sub(' ', _TAG_STRIP_RE.sub('', m.group(1))).strip()
+
+
+# ── JSON-LD field rendering ──────────────────────────────────
+# (key, formatter) pairs iterated per item instead of a long if/elif
+# chain — adding a schema.org field is one table row.
+
+def _fmt_names(plural, singular=None):
+    """Formatter for fields whose list entries may be dicts with a name"""
+    def fmt(v):
+        if isinstance(v, list):
+            return f"{plural}: " + ', '.join(
+                str(x.get('name', '') if isinstance(x, dict) else x) for x in v)
+        return f"{singular or plural}: {v}"
+    return fmt
+
+
+def _fmt_specialty(v):
+    if isinstance(v, list):
+        return f"Specialties: {', '.join(str(s) for s in v)}"
+    return f"Specialty: {v}"
+
+
+def _fmt_org(v):
+    if isinstance(v, dict):
+        return f"Hospital: {v.get('name', '')}"
+    if isinstance(v, str):
+        return f"Hospital: {v}"
+    return None
+
+
+def _fmt_address(v):
+    if not isinstance(v, dict):
+        return None
+    loc = [v.get('addressLocality', ''), v.get('addressRegion', ''), v.get('addressCountry', '')]
+    return f"Location: {', '.join(p for p in loc if p)}"
+
+
+def _fmt_credentials(v):
+    if isinstance(v, list):
+        return f"Credentials: " + ', '.join(
+            str(c.get('name', '') if isinstance(c, dict) else c) for c in v)
+    return None
+
+
+# schema.org types rendered as doctor/hospital profiles
+_MEDICAL_TYPES = frozenset({
+    'Physician', 'Person', 'MedicalBusiness', 'LocalBusiness',
+    'Hospital', 'MedicalOrganization', 'IndividualPhysician',
+})
+
+_JSONLD_FIELDS = (
+    ('name', lambda v: f"Name: {v}"),
+    ('jobTitle', lambda v: f"Title: {v}"),
+    ('description', lambda v: f"Description: {v}"),
+    ('medicalSpecialty', _fmt_specialty),
+    ('qualification', _fmt_names('Qualifications', 'Qualification')),
+    ('alumniOf', _fmt_names('Education')),
+    ('worksFor', _fmt_org),
+    ('address', _fmt_address),
+    ('memberOf', _fmt_names('Memberships')),
+    ('knowsAbout', lambda v: f"Expertise: {v}"),
+    ('hasCredential', _fmt_credentials),
+)
+
+
+def _extract_jsonld_blob(raw, texts):
+    """Parse one JSON-LD script body and append rendered items to texts"""
+    try:
+        data = _json_loads(raw)
+
+        # Handle @graph arrays
+        items = data if isinstance(data, list) else [data]
+        if isinstance(data, dict) and '@graph' in data:
+            items = data['@graph']
+
+        for item in items:
+            if not isinstance(item, dict):
                 continue
-            data = json.loads(raw)
+            item_type = item.get('@type', '')
+            # @type may be a list ("@type": ["Person", "Physician"]) —
+            # normalize so the frozenset lookup never hashes a list
+            types = item_type if isinstance(item_type, list) else (item_type,)
 
-            # Handle @graph arrays
-            items = data if isinstance(data, list) else [data]
-            if isinstance(data, dict) and '@graph' in data:
-                items = data['@graph']
+            # Doctor/Physician profiles
+            if any(t in _MEDICAL_TYPES for t in types if isinstance(t, str)):
+                parts = []
+                for key, fmt in _JSONLD_FIELDS:
+                    value = item.get(key)
+                    if value:
+                        rendered = fmt(value)
+                        if rendered:
+                            parts.append(rendered)
 
-            for item in items:
-                if not isinstance(item, dict):
-                    continue
-                item_type = item.get('@type', '')
-
-                # Doctor/Physician profiles
-                if item_type in ('Physician', 'Person', 'MedicalBusiness', 'LocalBusiness',
-                                 'Hospital', 'MedicalOrganization', 'IndividualPhysician'):
-                    parts = []
-                    if item.get('name'):
-                        parts.append(f"Name: {item['name']}")
-                    if item.get('jobTitle'):
-                        parts.append(f"Title: {item['jobTitle']}")
-                    if item.get('description'):
-                        parts.append(f"Description: {item['description']}")
-                    if item.get('medicalSpecialty'):
-                        spec = item['medicalSpecialty']
-                        if isinstance(spec, list):
-                            parts.append(f"Specialties: {', '.join(str(s) for s in spec)}")
-                        else:
-                            parts.append(f"Specialty: {spec}")
-                    if item.get('qualification'):
-                        quals = item['qualification']
-                        if isinstance(quals, list):
-                            parts.append(f"Qualifications: {', '.join(str(q.get('name','') if isinstance(q,dict) else q) for q in quals)}")
-                        else:
-                            parts.append(f"Qualification: {quals}")
-                    if item.get('alumniOf'):
-                        edu = item['alumniOf']
-                        if isinstance(edu, list):
-                            parts.append(f"Education: {', '.join(str(e.get('name','') if isinstance(e,dict) else e) for e in edu)}")
-                        else:
-                            parts.append(f"Education: {edu}")
-                    if item.get('worksFor'):
-                        org = item['worksFor']
-                        if isinstance(org, dict):
-                            parts.append(f"Hospital: {org.get('name', '')}")
-                        elif isinstance(org, str):
-                            parts.append(f"Hospital: {org}")
-                    if item.get('address'):
-                        addr = item['address']
-                        if isinstance(addr, dict):
-                            loc_parts = [addr.get('addressLocality',''), addr.get('addressRegion',''), addr.get('addressCountry','')]
-                            parts.append(f"Location: {', '.join(p for p in loc_parts if p)}")
-                    if item.get('memberOf'):
-                        m = item['memberOf']
-                        if isinstance(m, list):
-                            parts.append(f"Memberships: {', '.join(str(x.get('name','') if isinstance(x,dict) else x) for x in m)}")
-                        else:
-                            parts.append(f"Memberships: {m}")
-                    if item.get('knowsAbout'):
-                        parts.append(f"Expertise: {item['knowsAbout']}")
-                    if item.get('hasCredential'):
-                        creds = item['hasCredential']
-                        if isinstance(creds, list):
-                            parts.append(f"Credentials: {', '.join(str(c.get('name','') if isinstance(c,dict) else c) for c in creds)}")
-
-                    if parts:
-                        texts.append('\n'.join(parts))
-
-                # Also grab any item with substantial description
-                elif item.get('description') and len(str(item['description'])) > 50:
-                    texts.append(f"[{item_type}] {item.get('name','')}: {item['description']}")
-
-        except (json.JSONDecodeError, TypeError, AttributeError):
-            continue
+                if parts:
+                    texts.append('\n'.join(parts))
 
-    return '\n\n'.join(texts)
+            # Also grab any item with substantial description
+            elif item.get('description') and len(str(item['description'])) > 50:
+                texts.append(f"[{item_type}] {item.get('name','')}: {item['description']}")
+
+    except (json.JSONDecodeError, TypeError, AttributeError):
+        pass
 
 
 def extract_meta_tags(soup):
@@ -581,45 +760,43 @@ def extract_meta_tags(soup):
     return '\n'.join(parts)
 
 
-def extract_semantic_content(soup):
+def extract_semantic_content(soup, limit=8000):
     """
     Extract text from semantic HTML elements.
     Removes noise first, then extracts from main content areas.
-    """
-    from copy import copy
-    work = BeautifulSoup(str(soup), 'html.parser')
-
-    # Remove noise elements
-    noise_tags = ['script', 'style', 'nav', 'footer', 'header', 'iframe',
-                  'noscript', 'svg', 'button', 'form', 'aside', 'figure']
-    for tag in work.find_all(noise_tags):
-        tag.decompose()
+    Stops accumulating once `limit` chars are collected — callers
+    truncate to that budget anyway.
 
-    # Remove by class/id patterns (common noise)
-    noise_patterns = re.compile(
-        r'(cookie|consent|popup|modal|banner|advert|sidebar|widget|social|share|comment|related|'
-        r'newsletter|subscribe|breadcrumb|pagination|menu|nav-|foot|header|toolbar|sticky|overlay)',
-        re.I
-    )
-    for el in work.find_all(class_=noise_patterns):
-        el.decompose()
-    for el in work.find_all(id=noise_patterns):
-        el.decompose()
-
-    # Try to find main content area (priority order)
-    content_el = None
-    for selector_tag, selector_attrs in [
-        ('main', {}),
-        ('article', {}),
-        ('div', {'role': 'main'}),
-        ('div', {'class': re.compile(r'(content|main|doctor|profile|detail|about|bio|description)', re.I)}),
-        ('div', {'id': re.compile(r'(content|main|doctor|profile|detail|about|bio|description)', re.I)}),
-        ('section', {'class': re.compile(r'(content|main|doctor|profile|detail|about|bio)', re.I)}),
-    ]:
-        found = work.find(selector_tag, selector_attrs)
-        if found and len(found.get_text(strip=True)) > 150:
-            content_el = found
-            break
+    NOTE: mutates `soup` (noise elements are decomposed in place). Callers
+    run read-only extractors (JSON-LD, meta, Next.js data) before this.
+    """
+    work = soup
+
+    # Remove noise elements (by tag, class and id) in a single traversal.
+    # A match nested inside another match is already gone by the time we
+    # reach it, hence the decomposed guard.
+    for el in work.find_all(_is_noise):
+        if not el.decomposed:
+            el.decompose()
+
+    # Try to find main content area: one CSS query covers the semantic
+    # containers, then a single regex pass over div/section picks the
+    # largest class/id-matched candidate.
+    content_el = work.select_one('main, article, div[role="main"]')
+    if content_el is not None and len(content_el.get_text(strip=True)) <= 150:
+        content_el = None
+
+    if content_el is None:
+        best, best_len = None, 150
+        for el in work.find_all(['div', 'section']):
+            cls = ' '.join(el.get('class') or ())
+            eid = el.get('id') or ''
+            pattern = _CONTENT_CLASS_RE if el.name == 'div' else _SECTION_CLASS_RE
+            if (cls and pattern.search(cls)) or (el.name == 'div' and eid and pattern.search(eid)):
+                text_len = len(el.get_text(strip=True))
+                if text_len > best_len:
+                    best, best_len = el, text_len
+        content_el = best
 
     if not content_el:
         content_el = work.find('body') or work
@@ -627,10 +804,15 @@ def extract_semantic_content(soup):
     # Extract with structure preserved
     text_parts = []
     seen = set()
+    total_len = 0
 
     for element in content_el.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'p', 'li', 'td', 'th', 'dd', 'dt', 'blockquote']):
-        # Skip elements that are parents of other block elements (avoid duplication)
-        if element.name in ('div', 'section', 'td') and element.find(['h1', 'h2', 'h3', 'h4', 'p', 'li']):
+        if total_len >= limit:
+            break
+        # Skip cells that wrap other block elements (avoid duplication) —
+        # td is the only tag in the query above that can contain them, so
+        # the subtree .find only ever runs for table cells
+        if element.name == 'td' and element.find(['h1', 'h2', 'h3', 'h4', 'p', 'li']):
             continue
 
         text = element.get_text(separator=' ', strip=True)
@@ -639,11 +821,13 @@ def extract_semantic_content(soup):
         if not text or len(text) < 5:
             continue
 
-        # Deduplicate
-        text_clean = re.sub(r'\s+', ' ', text).strip()
-        if text_clean in seen:
+        # Deduplicate on a 64-bit hash — cheaper than keeping full strings.
+        # str.split/join collapses whitespace runs in C, no regex engine.
+        text_clean = ' '.join(text.split())
+        key = hash(text_clean)
+        if key in seen:
             continue
-        seen.add(text_clean)
+        seen.add(key)
 
         # Format based on tag type
         if element.name in ('h1', 'h2', 'h3', 'h4', 'h5'):
@@ -656,13 +840,17 @@ def extract_semantic_content(soup):
             text_parts.append(f"  {text_clean}")
         else:
             text_parts.append(text_clean)
+        total_len += len(text_parts[-1]) + 1
 
     return '\n'.join(text_parts)
 
 
-def extract_body_text(soup):
-    """Last resort: extract all visible text from body"""
-    work = BeautifulSoup(str(soup), 'html.parser')
+def extract_body_text(soup, limit=8000):
+    """
+    Last resort: extract all visible text from body, up to `limit` chars.
+    Like extract_semantic_content, strips noise from `soup` in place.
+    """
+    work = soup
 
     for tag in work.find_all(['script', 'style', 'nav', 'footer', 'iframe', 'noscript', 'svg']):
         tag.decompose()
@@ -670,9 +858,16 @@ def extract_body_text(soup):
     body = work.find('body') or work
     text = body.get_text(separator='\n', strip=True)
 
-    # Clean up
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    # Remove very short lines (likely nav items) unless they look like list items
-    lines = [l for l in lines if len(l) > 10 or l.startswith(('•', '-', '*', '–'))]
+    # Clean up: drop very short lines (likely nav items) unless they look
+    # like list items, and stop once the char budget is spent. The filter
+    # runs as a single C-level regex scan — get_text(strip=True) already
+    # stripped each line, so no per-line Python work is needed.
+    lines = []
+    total_len = 0
+    for m in _LINE_FILTER_RE.finditer(text):
+        lines.append(m.group())
+        total_len += m.end() - m.start() + 1
+        if total_len >= limit:
+            break
 
     return '\n'.join(lines)